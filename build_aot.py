@@ -0,0 +1,24 @@
+# build_aot.py — precompile the multirotor kernel into the mr_kernels
+# extension (.pyd/.so) next to this file. Run before PyInstaller.
+import os
+from numba import types
+from numba.pycc import CC
+
+from kernels import kernel_abi, mr_sweep_loop
+
+cc = CC("mr_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# kernels.py only loads a build whose kernel_abi() matches its own
+cc.export("kernel_abi", "i8()")(kernel_abi)
+
+# payloads is coerced to C-contiguous float32 by kernels.mr_sweep_aot
+_payloads = types.Array(types.float32, 1, "C", readonly=True)
+_out = types.Array(types.float64, 1, "C")
+cc.export("mr_sweep", types.UniTuple(_out, 2)(
+    _payloads, types.float64, types.int64,
+    types.float64, types.float64, types.float64,
+))(mr_sweep_loop)
+
+if __name__ == "__main__":
+    cc.compile()
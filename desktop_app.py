@@ -1,22 +1,33 @@
 # desktop_app.py — minimal wrapper to run Streamlit app in a desktop window
-import subprocess, sys, time, os, socket, webbrowser
+import subprocess, sys, time, os, socket, threading, webbrowser
+from collections import deque
+from typing import Optional
 
 APP_TITLE = "Aircraft & Multirotor Calculator"
 SCRIPT_BASENAME = "drone_app.py"
+READY_BANNER = "You can now view your Streamlit app"
+
+# when frozen by PyInstaller, files are unpacked to _MEIPASS; both bases are
+# fixed for the life of the process, so resolve them once
+_RES_BASE = getattr(sys, "_MEIPASS", os.path.abspath("."))
+_BASE = os.path.dirname(os.path.abspath(getattr(sys, "_MEIPASS", sys.argv[0])))
 
 def resource_path(rel_path: str) -> str:
-    # when frozen by PyInstaller, files are unpacked to _MEIPASS
-    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
-    return os.path.join(base, rel_path)
+    return os.path.join(_RES_BASE, rel_path)
 
 def script_path() -> str:
     # prefer external file next to the EXE (easy to update without rebuild)
-    here = os.path.dirname(os.path.abspath(getattr(sys, "_MEIPASS", sys.argv[0])))
-    external = os.path.join(here, SCRIPT_BASENAME)
+    external = os.path.join(_BASE, SCRIPT_BASENAME)
     return external if os.path.exists(external) else resource_path(SCRIPT_BASENAME)
 
-def find_free_port(start=8501, end=8999) -> int:
-    for p in range(start, end + 1):
+def find_free_port(start=None, end=None) -> int:
+    if start is None:
+        # let the OS pick a free ephemeral port in one bind
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+    # caller wants a specific range (e.g. 8501-8999): scan it
+    for p in range(start, (end or start) + 1):
         with socket.socket() as s:
             try:
                 s.bind(("127.0.0.1", p))
@@ -28,36 +39,82 @@ def find_free_port(start=8501, end=8999) -> int:
 def run_streamlit(app_path: str, port: int) -> subprocess.Popen:
     env = os.environ.copy()
     env["STREAMLIT_BROWSER_GATHER_USAGE_STATS"] = "false"
+    env["PYTHONUNBUFFERED"] = "1"  # so the ready banner isn't stuck in a pipe buffer
+    env["PYTHONIOENCODING"] = "utf-8"  # matches how we decode the pipe below
     cmd = [
         sys.executable, "-m", "streamlit", "run", app_path,
         "--server.headless=true", f"--server.port={port}",
         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false",
+        # no dev-mode assets or magic rewriting (drone_app.py uses no magic)
+        "--global.developmentMode=false", "--runner.magicEnabled=false",
+        "--client.toolbarMode=minimal",
+        # skips the blocking external-IP lookup headless mode does before printing
+        # the ready banner (slow on offline or firewalled machines)
+        "--browser.serverAddress=127.0.0.1",
     ]
-    return subprocess.Popen(cmd, env=env)
+    # output is piped so watch_output can look for the ready banner; undecodable
+    # bytes are replaced so they can't kill the reader thread
+    kwargs = dict(stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1,
+                  text=True, encoding="utf-8", errors="replace")
+    if sys.platform == "win32":
+        # no console window for the child, and don't hand it our stdin handle
+        kwargs.update(creationflags=subprocess.CREATE_NO_WINDOW, close_fds=True,
+                      stdin=subprocess.DEVNULL)
+    return subprocess.Popen(cmd, env=env, **kwargs)
+
+def _watch_output(proc: subprocess.Popen, ready: threading.Event, tail: deque) -> None:
+    # drain the child's output for its whole life so the pipe never fills up;
+    # echo it when we have a console and keep the tail for error messages
+    for line in proc.stdout:
+        tail.append(line)
+        if sys.stdout is not None:
+            try:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            except Exception:
+                pass
+        if not ready.is_set() and READY_BANNER in line:
+            ready.set()
+
+def watch_output(proc: subprocess.Popen, keep: int = 20):
+    ready = threading.Event()
+    tail = deque(maxlen=keep)
+    reader = threading.Thread(target=_watch_output, args=(proc, ready, tail), daemon=True)
+    reader.start()
+    return reader, ready, tail
 
-def wait_until_up(port: int, timeout: float = 60.0) -> bool:
-    import http.client
+def wait_until_up(port: int, timeout: float = 60.0,
+                  proc: Optional[subprocess.Popen] = None,
+                  ready: Optional[threading.Event] = None) -> bool:
+    # whichever comes first: the ready banner or the port accepting connections
     t0 = time.time()
     while time.time() - t0 < timeout:
+        if ready is not None and ready.is_set():
+            return True
         try:
-            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
-            conn.request("GET", "/")
-            if conn.getresponse().status in (200, 302, 403, 404):
-                return True
-        except Exception:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return True
+        except OSError:
             pass
-        time.sleep(0.3)
+        if proc is not None and proc.poll() is not None:
+            return False  # child exited before coming up
+        if ready is not None:
+            ready.wait(0.1)  # wakes early if the banner arrives
+        else:
+            time.sleep(0.1)
     return False
 
 def main():
     app = script_path()
     port = find_free_port()
     proc = run_streamlit(app, port)
+    reader, ready, tail = watch_output(proc)
 
-    if not wait_until_up(port):
+    if not wait_until_up(port, proc=proc, ready=ready):
         try: proc.terminate()
         except Exception: pass
-        raise SystemExit("Streamlit server did not start. Check app/logs.")
+        reader.join(2)  # let it collect the child's last lines
+        raise SystemExit("Streamlit server did not start. Last output:\n" + "".join(tail))
 
     url = f"http://127.0.0.1:{port}"
     # Try native webview if WebView2 exists; otherwise open default browser.
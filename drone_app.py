@@ -1,11 +1,85 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
+import altair as alt
 from reportlab.pdfgen import canvas
 from io import BytesIO
 
+from kernels import mr_sweep
+
 st.set_page_config(page_title="Aircraft & Multirotor Calculator", layout="wide")
 
+# Fixed chart sample points, shared across reruns (read-only so nothing
+# mutates them in place). float32 is plenty for plotting and halves what
+# gets serialized to the browser.
+_SPEEDS = np.linspace(20.0, 100.0, 30, dtype=np.float32)
+_SPEEDS.setflags(write=False)
+_PAYLOADS = np.linspace(0.5, 5.0, 20, dtype=np.float32)
+_PAYLOADS.setflags(write=False)
+
+# -----------------------
+# Cached computations
+# -----------------------
+# Streamlit reruns the whole script on every widget change; these only
+# recompute when their inputs change.
+@st.cache_data
+def compute_stall_speed(weight, gravity, air_density, wing_area, cl):
+    return np.sqrt((2 * weight * gravity) / (air_density * wing_area * cl))
+
+@st.cache_data
+def aero_power_curve(air_density, wing_area, drag_coeff=0.03):
+    # P = 0.5*rho*v^2*S*Cd * v / 1000 (kW), computed in place in one buffer
+    power_required = np.multiply(_SPEEDS, _SPEEDS)
+    power_required *= 0.5 * air_density * wing_area * drag_coeff / 1000.0
+    power_required *= _SPEEDS
+    return pd.DataFrame({"Speed (m/s)": _SPEEDS, "Power (kW)": power_required})
+
+@st.cache_data
+def multirotor_sweep(frame_weight, num_rotors, k, batt_j, gravity):
+    endurance_vals, throttle_vals = mr_sweep(_PAYLOADS, float(frame_weight), int(num_rotors),
+                                             float(k), float(batt_j), float(gravity))
+    return pd.DataFrame({"Payload (kg)": _PAYLOADS,
+                         "Endurance (min)": endurance_vals.astype(np.float32, copy=False),
+                         "Hover throttle": throttle_vals.astype(np.float32, copy=False)})
+
+def _rows(air_density, gravity, wing_area, weight, cl, stall_speed, thrust,
+          prop_efficiency, fuel_mass, endurance, num_rotors, rotor_diameter,
+          battery_capacity, battery_voltage) -> tuple[tuple[str, str], ...]:
+    # numbers are formatted canonically at full precision (1200 and 1200.0
+    # both render as "1200"), so equivalent inputs share one _build_pdf entry
+    return (("Air Density", f"{float(air_density):.15g} kg/m³"),
+            ("Gravity", f"{float(gravity):.15g} m/s²"),
+            ("Wing Area", f"{float(wing_area):.15g} m²"),
+            ("Weight", f"{float(weight):.15g} kg"),
+            ("Lift Coefficient", f"{float(cl):.15g}"),
+            ("Stall Speed", f"{stall_speed:.2f} m/s"),
+            ("Thrust", f"{float(thrust):.15g} N"),
+            ("Propeller Efficiency", f"{prop_efficiency*100:.1f}%"),
+            ("Fuel Mass", f"{float(fuel_mass):.15g} kg"),
+            ("Estimated Endurance", f"{endurance:.2f} hr"),
+            ("Number of Rotors", f"{int(num_rotors)}"),
+            ("Rotor Diameter", f"{float(rotor_diameter):.15g} m"),
+            ("Battery Capacity", f"{float(battery_capacity):.15g} mAh"),
+            ("Battery Voltage", f"{float(battery_voltage):.15g} V"),
+            ("Multirotor Endurance", f"{endurance:.1f} min"))
+
+@st.cache_data
+def _build_pdf(rows: tuple[tuple[str, str], ...]) -> bytes:
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    c.setFont("Helvetica", 14)
+    c.drawString(100, 800, "Aircraft & Multirotor Calculator Report")
+
+    # one text object for all rows; leading replaces manual y bookkeeping
+    t = c.beginText(100, 770)
+    t.setFont("Helvetica", 14, leading=20)
+    for label, val in rows:
+        t.textLine(f"{label}: {val}")
+    c.drawText(t)
+
+    c.save()
+    return buf.getvalue()
+
 st.title("✈️ Aircraft & Multirotor Calculator")
 
 # Sidebar for general inputs
@@ -27,22 +101,24 @@ with tab1:
     weight = st.number_input("Weight (kg)", value=1200.0, step=10.0)
     cl = st.number_input("Lift Coefficient (Cl)", value=1.2, step=0.1)
 
-    # Stall speed
+    # Stall speed (NaN until the inputs are valid)
+    stall_speed = float("nan")
     if wing_area > 0 and air_density > 0 and cl > 0:
-        stall_speed = np.sqrt((2 * weight * gravity) / (air_density * wing_area * cl))
+        stall_speed = compute_stall_speed(weight, gravity, air_density, wing_area, cl)
         st.metric("Stall Speed", f"{stall_speed:.2f} m/s ({stall_speed*3.6:.1f} km/h)")
     else:
         st.warning("Enter valid values for Wing Area, Air Density and Cl")
 
     # Drag & power curve
     st.markdown("#### Power Required vs Airspeed")
-    speeds = np.linspace(20, 100, 30)
-    drag_coeff = 0.03
-    drag = 0.5 * air_density * speeds**2 * wing_area * drag_coeff
-    power_required = drag * speeds / 1000  # in kW
-    df = pd.DataFrame({"Speed (m/s)": speeds, "Power (kW)": power_required})
+    df = aero_power_curve(air_density, wing_area)
 
-    st.line_chart(df.set_index("Speed (m/s)"))
+    # explicit Altair encodings skip st.line_chart's per-rerun schema inference
+    chart = alt.Chart(df).mark_line().encode(
+        x=alt.X("Speed (m/s)", type="quantitative"),
+        y=alt.Y("Power (kW)", type="quantitative"),
+    )
+    st.altair_chart(chart, width="stretch")
 
 # -----------------------
 # Propulsion Tab
@@ -57,7 +133,7 @@ with tab2:
     fuel_mass = st.number_input("Fuel Mass (kg)", value=100.0, step=1.0)
 
     # Power available
-    if prop_efficiency > 0:
+    if np.isfinite(stall_speed) and prop_efficiency > 0:
         power_available = thrust * stall_speed / 1000 / prop_efficiency
         st.metric("Power Available", f"{power_available:.2f} kW")
 
@@ -80,14 +156,17 @@ with tab3:
     frame_weight = st.number_input("Frame Weight (kg)", value=1.5, step=0.1)
 
     # Simple hover thrust requirement
+    # rotor/battery constants shared by the hover metrics and the sweep
+    disk_area = 0.25 * np.pi * rotor_diameter * rotor_diameter
+    k = 2.0 * air_density * disk_area
+    batt_j = (battery_capacity * 1e-3) * battery_voltage * 3600.0  # Joules
+
     total_weight = (payload + frame_weight) * gravity
     thrust_per_motor = total_weight / num_rotors
-    disk_area = np.pi * (rotor_diameter/2)**2
-    induced_velocity = np.sqrt(thrust_per_motor / (2 * air_density * disk_area))
+    induced_velocity = np.sqrt(thrust_per_motor / k)
     power_per_motor = thrust_per_motor * induced_velocity
     total_power = power_per_motor * num_rotors
-    total_energy = (battery_capacity/1000) * battery_voltage * 3600  # Joules
-    endurance = total_energy / (total_power * 1.0) / 60  # in minutes
+    endurance = batt_j / total_power / 60  # in minutes
 
     st.metric("Thrust per Motor", f"{thrust_per_motor:.1f} N")
     st.metric("Total Hover Power", f"{total_power/1000:.2f} kW")
@@ -95,21 +174,15 @@ with tab3:
 
     # Graphs
     st.markdown("#### Payload vs Endurance")
-    payloads = np.linspace(0.5, 5.0, 20)
-    endurance_vals = []
-    throttle_vals = []
-    for p in payloads:
-        tw = (p + frame_weight) * gravity
-        tpm = tw / num_rotors
-        iv = np.sqrt(tpm / (2 * air_density * disk_area))
-        ppm = tpm * iv
-        tp = ppm * num_rotors
-        te = (battery_capacity/1000) * battery_voltage * 3600 / tp / 60
-        endurance_vals.append(te)
-        throttle_vals.append(tpm / (9.8 * (frame_weight/num_rotors + p/num_rotors)))
-
-    df_mr = pd.DataFrame({"Payload (kg)": payloads, "Endurance (min)": endurance_vals, "Hover throttle": throttle_vals})
-    st.line_chart(df_mr.set_index("Payload (kg)")[["Endurance (min)", "Hover throttle"]])
+    df_mr = multirotor_sweep(frame_weight, num_rotors, k, batt_j, gravity)
+    chart = alt.Chart(df_mr).transform_fold(
+        ["Endurance (min)", "Hover throttle"], as_=["series", "value"]
+    ).mark_line().encode(
+        x=alt.X("Payload (kg)", type="quantitative"),
+        y=alt.Y("value", type="quantitative"),
+        color=alt.Color("series", type="nominal"),
+    )
+    st.altair_chart(chart, width="stretch")
 
 # -----------------------
 # Export Report
@@ -119,30 +192,8 @@ st.subheader("📄 Export Results")
 report_btn = st.button("Download PDF Report")
 
 if report_btn:
-    buf = BytesIO()
-    c = canvas.Canvas(buf)
-    c.setFont("Helvetica", 14)
-    c.drawString(100, 800, "Aircraft & Multirotor Calculator Report")
-
-    y = 770
-    for label, val in [("Air Density", f"{air_density} kg/m³"),
-                       ("Gravity", f"{gravity} m/s²"),
-                       ("Wing Area", f"{wing_area} m²"),
-                       ("Weight", f"{weight} kg"),
-                       ("Lift Coefficient", f"{cl}"),
-                       ("Stall Speed", f"{stall_speed:.2f} m/s"),
-                       ("Thrust", f"{thrust} N"),
-                       ("Propeller Efficiency", f"{prop_efficiency*100:.1f}%"),
-                       ("Fuel Mass", f"{fuel_mass} kg"),
-                       ("Estimated Endurance", f"{endurance:.2f} hr"),
-                       ("Number of Rotors", f"{num_rotors}"),
-                       ("Rotor Diameter", f"{rotor_diameter} m"),
-                       ("Battery Capacity", f"{battery_capacity} mAh"),
-                       ("Battery Voltage", f"{battery_voltage} V"),
-                       ("Multirotor Endurance", f"{endurance:.1f} min")]:
-        c.drawString(100, y, f"{label}: {val}")
-        y -= 20
-
-    c.save()
-    buf.seek(0)
-    st.download_button("Save PDF", buf, "drone_report.pdf", "application/pdf")
+    rows = _rows(air_density, gravity, wing_area, weight, cl, stall_speed, thrust,
+                 prop_efficiency, fuel_mass, endurance, num_rotors, rotor_diameter,
+                 battery_capacity, battery_voltage)
+    st.download_button("Save PDF", data=_build_pdf(rows),
+                       file_name="drone_report.pdf", mime="application/pdf")
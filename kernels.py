@@ -0,0 +1,58 @@
+# kernels.py — numeric kernels for drone_app.py (kept free of Streamlit so
+# build_aot.py can import and precompile them)
+import math
+import numpy as np
+
+# k = 2 * air_density * disk_area, batt_j = battery energy in Joules
+
+def mr_sweep_np(payloads, frame_weight, num_rotors, k, batt_j, gravity):
+    tpm = (payloads + frame_weight) * gravity / num_rotors
+    iv = np.sqrt(tpm / k)
+    tp = tpm * iv * num_rotors
+    return batt_j / tp / 60, tpm / (9.8 * (frame_weight + payloads) / num_rotors)
+
+def mr_sweep_loop(payloads, frame_weight, num_rotors, k, batt_j, gravity):
+    # single fused pass, no temporaries; compiled by numba when available
+    n = payloads.shape[0]
+    end = np.empty(n)
+    thr = np.empty(n)
+    for i in range(n):
+        tpm = (payloads[i] + frame_weight) * gravity / num_rotors
+        iv = math.sqrt(tpm / k)
+        tp = tpm * iv * num_rotors
+        end[i] = batt_j / tp / 60
+        thr[i] = tpm / (9.8 * (frame_weight + payloads[i]) / num_rotors)
+    return end, thr
+
+# Bump whenever mr_sweep_loop's signature changes, so a stale mr_kernels
+# build left next to the app is ignored instead of failing on every call.
+KERNEL_ABI = 2
+
+def kernel_abi():
+    return KERNEL_ABI
+
+def _load_aot():
+    try:
+        import mr_kernels
+    except ImportError:
+        return None
+    if getattr(mr_kernels, "kernel_abi", lambda: None)() != KERNEL_ABI:
+        return None
+
+    def mr_sweep_aot(payloads, frame_weight, num_rotors, k, batt_j, gravity):
+        # the export only takes C-contiguous float32 (pycc checks just the
+        # item size), so coerce here to accept what the other paths accept
+        payloads = np.ascontiguousarray(payloads, dtype=np.float32)
+        return mr_kernels.mr_sweep(payloads, frame_weight, num_rotors, k, batt_j, gravity)
+    return mr_sweep_aot
+
+# Prefer the ahead-of-time build (python build_aot.py) so the packaged app
+# never pays a JIT stall; then numba JIT (cache=True keeps the compiled
+# kernel on disk across restarts); then plain NumPy.
+mr_sweep = _load_aot()
+if mr_sweep is None:
+    try:
+        from numba import njit
+        mr_sweep = njit(cache=True, fastmath=True)(mr_sweep_loop)
+    except ImportError:
+        mr_sweep = mr_sweep_np